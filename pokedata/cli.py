@@ -1,16 +1,21 @@
 """CLI module for pokedata."""
 
+from contextlib import contextmanager
 from dataclasses import dataclass
+import logging
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, List, Optional
 
-from loguru import logger
 import typer
 
-from pokedata.config import ConfigDict, ConfigError, load_config
-from pokedata.cvat import CVATClient, CVATError
 from pokedata.dataset_cli import dataset_app
-from pokedata.dataset_layout import DatasetLayout
+
+# Heavy modules (yaml, requests, polvo) are imported inside the commands that
+# need them, so `--help` and shell completion stay fast.
+if TYPE_CHECKING:
+    from pokedata.config import ConfigDict
+    from pokedata.cvat import CVATClient
+    from pokedata.dataset_layout import DatasetLayout
 
 app = typer.Typer()
 app.add_typer(dataset_app, name="dataset")
@@ -18,8 +23,8 @@ app.add_typer(dataset_app, name="dataset")
 
 @dataclass
 class CLIContext:
-    config: ConfigDict
-    dataset_layout: DatasetLayout
+    config: "ConfigDict"
+    dataset_layout: "DatasetLayout"
 
 
 @app.callback()
@@ -32,6 +37,13 @@ def main(
     ),
 ) -> None:
     """Main entry point for the CLI."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)-8s | %(name)s - %(message)s",
+    )
+    from pokedata.config import load_config
+    from pokedata.dataset_layout import DatasetLayout
+
     config = load_config(config_path, secrets_path)
     if dataset_repo:
         config["datasets"]["dataset_repo"] = dataset_repo
@@ -41,6 +53,39 @@ def main(
     ctx.obj = CLIContext(config=config, dataset_layout=dataset_layout)
 
 
+@contextmanager
+def _exit_on_error() -> Iterator[None]:
+    """Report a failed command on stderr and exit with status 1."""
+    from pokedata.config import ConfigError
+    from pokedata.cvat import CVATError
+
+    try:
+        yield
+    except ConfigError as e:
+        typer.echo(f"✗ Configuration error: {e}", err=True)
+        raise typer.Exit(1)
+    except CVATError as e:
+        typer.echo(f"✗ CVAT error: {e}", err=True)
+        raise typer.Exit(1)
+    except KeyError as e:
+        typer.echo(f"✗ Missing configuration key: {e}", err=True)
+        raise typer.Exit(1)
+    except Exception as e:
+        typer.echo(f"✗ Unexpected error: {e}", err=True)
+        raise typer.Exit(1)
+
+
+def _cvat_client(cli_context: CLIContext) -> "CVATClient":
+    """Create a CVAT client from the config and the directory it downloads into."""
+    from pokedata.cvat import CVATClient
+
+    api_url = cli_context.config["cvat"]["url"]
+    auth = cli_context.config["cvat"]["auth"]
+
+    cli_context.dataset_layout.cvat_raw.mkdir(parents=True, exist_ok=True)
+    return CVATClient(api_url=api_url, auth=auth)
+
+
 @app.command()
 def download_task(
     ctx: typer.Context,
@@ -48,14 +93,9 @@ def download_task(
     format: str = typer.Option("LabelMe 3.0", help="Annotation format"),
 ) -> None:
     """Download a task's dataset from CVAT."""
-    try:
-        cli_context = ctx.obj
-        api_url = cli_context.config["cvat"]["url"]
-        auth = cli_context.config["cvat"]["auth"]
-
-        # Create CVAT client and download task
-        cli_context.dataset_layout.cvat_raw.mkdir(parents=True, exist_ok=True)
-        client = CVATClient(api_url=api_url, auth=auth)
+    cli_context = ctx.obj
+    with _exit_on_error():
+        client = _cvat_client(cli_context)
         result_path = client.download_task(
             task_id=task_id,
             output_dir=cli_context.dataset_layout.cvat_raw,
@@ -64,18 +104,26 @@ def download_task(
 
         typer.echo(f"✓ Task {task_id} downloaded successfully to: {result_path}")
 
-    except ConfigError as e:
-        typer.echo(f"✗ Configuration error: {e}", err=True)
-        raise typer.Exit(1)
-    except CVATError as e:
-        typer.echo(f"✗ CVAT error: {e}", err=True)
-        raise typer.Exit(1)
-    except KeyError as e:
-        typer.echo(f"✗ Missing configuration key: {e}", err=True)
-        raise typer.Exit(1)
-    except Exception as e:
-        typer.echo(f"✗ Unexpected error: {e}", err=True)
-        raise typer.Exit(1)
+
+@app.command()
+def download_tasks(
+    ctx: typer.Context,
+    task_ids: List[int],
+    format: str = typer.Option("LabelMe 3.0", help="Annotation format"),
+) -> None:
+    """Download several tasks' datasets from CVAT over one connection pool."""
+    cli_context = ctx.obj
+    with _exit_on_error():
+        # A single client reuses its session, and its connections, across tasks
+        client = _cvat_client(cli_context)
+        result_paths = client.download_tasks(
+            task_ids=task_ids,
+            output_dir=cli_context.dataset_layout.cvat_raw,
+            format=format,
+        )
+
+        for task_id, result_path in zip(task_ids, result_paths):
+            typer.echo(f"✓ Task {task_id} downloaded successfully to: {result_path}")
 
 
 if __name__ == "__main__":
@@ -1,15 +1,23 @@
 """Configuration loading with environment variable substitution."""
 
+from collections import ChainMap
+import logging
 import os
 import re
 from pathlib import Path
-from typing import Any, Dict, Union
-import yaml
-from loguru import logger
+from typing import Any, Dict, Mapping, Tuple, Union
+
+logger = logging.getLogger(__name__)
 
 # Type alias for configuration dictionaries
 ConfigDict = Dict[str, Any]
 
+# Matches ${VAR_NAME} placeholders
+_ENV_VAR_RE = re.compile(r"\$\{([^}]+)\}")
+
+# Parsed YAML files keyed by (resolved path, mtime in ns, size in bytes)
+_YAML_CACHE: Dict[Tuple[str, int, int], ConfigDict] = {}
+
 
 class ConfigError(Exception):
     """Raised when configuration loading or validation fails."""
@@ -17,7 +25,43 @@ class ConfigError(Exception):
     pass
 
 
-def _substitute_env_vars(value: Any, variables: Dict[str, str]) -> Any:
+def _lookup_variable(var_name: str, variables: Mapping[str, str]) -> str:
+    try:
+        return variables[var_name]
+    except KeyError:
+        # If not found, raise an error
+        raise ConfigError(
+            f"Environment variable '{var_name}' not found in variables dict."
+        ) from None
+
+
+class _ResolvedVariables(dict):
+    """Variables looked up so far, each name is resolved from `variables` once."""
+
+    def __init__(self, variables: Mapping[str, str]):
+        super().__init__()
+        self._variables = variables
+
+    def __missing__(self, var_name: str) -> str:
+        value = self[var_name] = self._variables[var_name]
+        return value
+
+
+def _substitute_string(value: str, variables: Mapping[str, str]) -> str:
+    if "${" not in value:
+        return value
+
+    # The whole value is a single placeholder, e.g. "${CVAT_AUTH}"
+    if match := _ENV_VAR_RE.fullmatch(value):
+        return _lookup_variable(match.group(1), variables)
+
+    def replace_var(match: re.Match) -> str:
+        return _lookup_variable(match.group(1), variables)
+
+    return _ENV_VAR_RE.sub(replace_var, value)
+
+
+def _substitute_env_vars(value: Any, variables: Mapping[str, str]) -> Any:
     """
     Recursively substitute environment variables in configuration values.
 
@@ -25,7 +69,7 @@ def _substitute_env_vars(value: Any, variables: Dict[str, str]) -> Any:
 
     Args:
         value: Configuration value (string, dict, list, etc.)
-        variables: Dictionary mapping variable names to their values
+        variables: Mapping of variable names to their values
 
     Returns:
         Value with environment variables substituted
@@ -34,26 +78,34 @@ def _substitute_env_vars(value: Any, variables: Dict[str, str]) -> Any:
         ConfigError: If an environment variable placeholder is found but the
             variable is not set in the variables dict
     """
+    if not isinstance(value, (str, dict, list)):
+        return value
+
+    # The same names tend to repeat across a config, and lookups through
+    # os.environ are not free
+    variables = _ResolvedVariables(variables)
     if isinstance(value, str):
-        # Pattern to match ${VAR_NAME}
-        pattern = r"\$\{([^}]+)\}"
-
-        def replace_var(match: re.Match) -> str:
-            var_name = match.group(1)
-            if var_name in variables:
-                return variables[var_name]
-            # If not found, raise an error
-            raise ConfigError(
-                f"Environment variable '{var_name}' not found in variables dict."
-            )
+        return _substitute_string(value, variables)
 
-        return re.sub(pattern, replace_var, value)
-    elif isinstance(value, dict):
-        return {k: _substitute_env_vars(v, variables) for k, v in value.items()}
-    elif isinstance(value, list):
-        return [_substitute_env_vars(item, variables) for item in value]
-    else:
-        return value
+    result = value.copy()
+
+    # Walk nested dicts and lists with an explicit stack instead of recursing,
+    # copying each container before substituting into it
+    stack = [result]
+    while stack:
+        container = stack.pop()
+        if isinstance(container, dict):
+            items = container.items()
+        else:
+            items = enumerate(container)
+        for key, item in items:
+            if isinstance(item, str):
+                container[key] = _substitute_string(item, variables)
+            elif isinstance(item, (dict, list)):
+                container[key] = item.copy()
+                stack.append(container[key])
+
+    return result
 
 
 def _merge_config(base: ConfigDict, override: ConfigDict) -> ConfigDict:
@@ -67,17 +119,49 @@ def _merge_config(base: ConfigDict, override: ConfigDict) -> ConfigDict:
     Returns:
         Merged configuration dictionary
     """
+    if not override:
+        return base.copy()
+    if not base:
+        return override.copy()
+
     result = base.copy()
 
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = _merge_config(result[key], value)
-        else:
-            result[key] = value
+    # Walk nested dicts with an explicit stack instead of recursing
+    stack = [(result, override)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                merged = current.copy()
+                target[key] = merged
+                stack.append((merged, value))
+            else:
+                target[key] = value
 
     return result
 
 
+def _clone(value: Any) -> Any:
+    """Deep copy parsed YAML, which only nests dicts, lists, tuples and sets.
+
+    Tuples come from `!!omap` and `!!pairs`, which load as lists of pairs.
+
+    Much cheaper than `copy.deepcopy`, which dispatches per type and keeps a
+    memo. Other YAML values (str, numbers, dates, None, ...) are immutable.
+    """
+    value_type = type(value)
+    if value_type is dict:
+        return {k: _clone(v) for k, v in value.items()}
+    if value_type is list:
+        return [_clone(v) for v in value]
+    if value_type is tuple:
+        return tuple(_clone(v) for v in value)
+    if value_type is set:
+        return set(value)
+    return value
+
+
 def load_config_structure(config_path: Path) -> ConfigDict:
     """
     Load configuration structure from YAML file without variable substitution.
@@ -85,6 +169,10 @@ def load_config_structure(config_path: Path) -> ConfigDict:
     Loads the YAML file and returns the configuration dictionary as-is.
     Use this when you need the raw config structure (e.g., for loading credentials files).
 
+    Parsed files are cached by path, modification time and size, so repeated
+    loads of an unchanged file skip parsing. A copy is returned on every call,
+    callers are free to mutate it.
+
     Args:
         config_path: Path to config YAML file.
 
@@ -94,12 +182,26 @@ def load_config_structure(config_path: Path) -> ConfigDict:
     Raises:
         ConfigError: If config file is missing or invalid
     """
-    if not config_path.exists():
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
         raise ConfigError(f"Configuration file not found: {config_path}")
 
+    cache_key = (str(config_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    if cache_key in _YAML_CACHE:
+        return _clone(_YAML_CACHE[cache_key])
+
+    # Imported here so that importing this module does not pay for PyYAML
+    import yaml
+
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+
     try:
-        with open(config_path, "r") as f:
-            config = yaml.safe_load(f)
+        with open(config_path, "rb") as f:
+            config = yaml.load(f, Loader=SafeLoader)
     except yaml.YAMLError as e:
         raise ConfigError(f"Failed to parse YAML configuration: {e}")
     except Exception as e:
@@ -108,7 +210,13 @@ def load_config_structure(config_path: Path) -> ConfigDict:
     if not isinstance(config, dict):
         raise ConfigError("Configuration file must contain a YAML dictionary")
 
-    return config
+    _YAML_CACHE[cache_key] = config
+    return _clone(config)
+
+
+def clear_config_cache() -> None:
+    """Clear the cache of parsed configuration files."""
+    _YAML_CACHE.clear()
 
 
 def resolve_config_variables(
@@ -154,13 +262,15 @@ def resolve_config_variables(
                 raise
             # Log warning but don't fail - credentials file is optional
             logger.warning(
-                f"Failed to load credentials file {credentials_path}: {e}, using only environment variables"
+                "Failed to load credentials file %s: %s, using only environment variables",
+                credentials_path,
+                e,
             )
             credentials_yaml = {}
 
-    env_vars = dict(os.environ)
-    # Merge: env vars override credentials (env vars take precedence)
-    credentials = {**credentials_yaml, **env_vars}
+    # Env vars override credentials (env vars take precedence). The ChainMap
+    # looks names up lazily instead of copying the whole environment
+    credentials = ChainMap(os.environ, credentials_yaml)
     return _substitute_env_vars(config, credentials)
 
 
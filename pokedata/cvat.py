@@ -1,11 +1,43 @@
 """CVAT API client for downloading tasks and annotations."""
 
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatchcase
+import logging
+import posixpath
+import sys
 import zipfile
 from pathlib import Path
+from typing import Iterable, List, Optional
 from http import HTTPStatus
+from tempfile import SpooledTemporaryFile
 
 import requests
-from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# ZIPs smaller than this are kept in memory, larger ones spill to a temp file
+_SPOOL_MAX_SIZE = 64 * 1024 * 1024
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Connections kept alive per host by the client session
+_POOL_SIZE = 10
+# Retries for failed connections and for transient gateway errors, which CVAT
+# returns while an export is still being prepared behind a proxy
+_MAX_RETRIES = 3
+_RETRY_BACKOFF_FACTOR = 0.3
+_RETRY_STATUSES = (
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+)
+# Threads writing extracted ZIP members concurrently
+_EXTRACT_WORKERS = 8
+# A ZIP starts with a local file header, or the end record when it is empty
+_ZIP_SIGNATURES = (b"PK\x03\x04", b"PK\x05\x06")
+_ZIP_SIGNATURE_SIZE = 4
+# Tasks downloaded concurrently by `download_tasks`, kept within _POOL_SIZE
+_DOWNLOAD_WORKERS = 4
 
 
 class CVATError(Exception):
@@ -14,6 +46,49 @@ class CVATError(Exception):
     pass
 
 
+def _extract_all(
+    zip_ref: zipfile.ZipFile,
+    target_dir: Path,
+    include: Optional[Iterable[str]] = None,
+) -> None:
+    """
+    Extract the members of a ZIP file, writing members concurrently.
+
+    Reads from the shared archive are serialized by `zipfile`, while
+    decompression and file writes overlap across threads. One member per
+    directory is extracted up front so that workers never race to create the
+    same parent directory.
+
+    If `include` is given, only members whose name matches one of its glob
+    patterns (e.g. "annotations/*") are extracted.
+    """
+    members = zip_ref.infolist()
+    if include is not None:
+        patterns = list(include)
+        members = [
+            member
+            for member in members
+            if any(fnmatchcase(member.filename, pattern) for pattern in patterns)
+        ]
+
+    seen_dirs = set()
+    serial, parallel = [], []
+    for member in members:
+        parent = posixpath.dirname(member.filename)
+        if member.is_dir() or parent not in seen_dirs:
+            serial.append(member)
+            seen_dirs.add(parent)
+        else:
+            parallel.append(member)
+
+    for member in serial:
+        zip_ref.extract(member, target_dir)
+
+    with ThreadPoolExecutor(max_workers=_EXTRACT_WORKERS) as executor:
+        for _ in executor.map(lambda m: zip_ref.extract(m, target_dir), parallel):
+            pass
+
+
 class CVATClient:
     """Client for interacting with the CVAT API."""
 
@@ -30,6 +105,25 @@ class CVATClient:
 
         self.session = requests.Session()
         self.session.headers.update({"Authorization": auth})
+        adapter = HTTPAdapter(
+            pool_connections=_POOL_SIZE,
+            pool_maxsize=_POOL_SIZE,
+            max_retries=Retry(
+                total=_MAX_RETRIES,
+                backoff_factor=_RETRY_BACKOFF_FACTOR,
+                status_forcelist=_RETRY_STATUSES,
+                # Hand the last error response back so it maps to a CVATError
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _read_response_body(
+        self, response: requests.Response, chunk_size: int
+    ) -> Iterable[bytes]:
+        """Stream a response body in chunks, override to change how it is read."""
+        return response.iter_content(chunk_size=chunk_size)
 
     def download_task(
         self,
@@ -38,6 +132,8 @@ class CVATClient:
         format: str = "COCO 1.0",
         save_images: bool = True,
         timeout: int = 300,
+        chunk_size: int = _DOWNLOAD_CHUNK_SIZE,
+        include: Optional[Iterable[str]] = None,
     ) -> Path:
         """
         Download a task's dataset (images and annotations) from CVAT.
@@ -50,6 +146,9 @@ class CVATClient:
             format: Annotation format (default: "COCO 1.0")
             save_images: Whether to include images in the export (default: True)
             timeout: Maximum time to wait for download in seconds (default: 300)
+            chunk_size: Bytes read from the response at a time (default: 1 MiB)
+            include: Glob patterns of ZIP members to extract, e.g.
+                ["annotations/*"] (default: None, extract everything)
 
         Returns:
             Path to the extracted dataset directory
@@ -57,7 +156,7 @@ class CVATClient:
         Raises:
             CVATError: If the download or extraction fails
         """
-        logger.info(f"Starting download for task {task_id} in format {format}")
+        logger.info("Starting download for task %s in format %s", task_id, format)
 
         # CVAT v1 API: GET /api/v1/tasks/{id}/dataset with action=download
         dataset_url = f"{self.api_url}/tasks/{task_id}/dataset"
@@ -89,42 +188,104 @@ class CVATClient:
         except requests.exceptions.RequestException as e:
             raise CVATError(f"Network error while downloading dataset: {e}") from e
 
-        # Save ZIP to temporary location
         output_dir.mkdir(parents=True, exist_ok=True)
         task_output_dir = output_dir / f"task_{task_id}"
         task_output_dir.mkdir(parents=True, exist_ok=True)
-        zip_path = task_output_dir / "dataset.zip"
-
-        logger.info(f"Downloading dataset for task {task_id}")
 
-        try:
-            with open(zip_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-        except IOError as e:
-            raise CVATError(f"Failed to save dataset ZIP file: {e}") from e
+        logger.info("Downloading dataset for task %s", task_id)
 
-        logger.info(f"Dataset ZIP saved to {zip_path}")
+        # Buffer the ZIP in a spooled file and extract from it directly, the
+        # archive itself never lands in the output directory
+        with SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE) as spool:
+            header = b""
+            try:
+                for chunk in self._read_response_body(response, chunk_size):
+                    if not chunk:
+                        continue
+                    # Check the signature as soon as it arrives, so that an
+                    # error page is not downloaded in full before failing
+                    if len(header) < _ZIP_SIGNATURE_SIZE:
+                        header += chunk[: _ZIP_SIGNATURE_SIZE - len(header)]
+                        if (
+                            len(header) == _ZIP_SIGNATURE_SIZE
+                            and header not in _ZIP_SIGNATURES
+                        ):
+                            response.close()
+                            raise CVATError(
+                                f"Invalid ZIP file downloaded: "
+                                f"unexpected signature {header!r}"
+                            )
+                    spool.write(chunk)
+            except IOError as e:
+                raise CVATError(f"Failed to save dataset ZIP file: {e}") from e
+            spool.seek(0)
+            # zipfile needs seekable(), which SpooledTemporaryFile only has
+            # from Python 3.11, before that read from the file it wraps
+            zip_source = spool if sys.version_info >= (3, 11) else spool._file
 
-        # Extract the ZIP file
-        try:
-            with zipfile.ZipFile(zip_path, "r") as zip_ref:
-                zip_ref.extractall(task_output_dir)
-            logger.info(f"Dataset extracted to {task_output_dir}")
-        except zipfile.BadZipFile as e:
-            raise CVATError(f"Invalid ZIP file downloaded: {e}") from e
-        except zipfile.LargeZipFile as e:
-            raise CVATError(f"ZIP file too large to extract: {e}") from e
-        except Exception as e:
-            raise CVATError(f"Failed to extract ZIP file: {e}") from e
-
-        # Optionally remove the ZIP file after extraction
-        try:
-            zip_path.unlink()
-            logger.debug(f"Removed ZIP file {zip_path}")
-        except Exception as e:
-            logger.warning(f"Failed to remove ZIP file {zip_path}: {e}")
+            # Extract the ZIP file
+            try:
+                with zipfile.ZipFile(zip_source, "r") as zip_ref:
+                    _extract_all(zip_ref, task_output_dir, include)
+                logger.info("Dataset extracted to %s", task_output_dir)
+            except zipfile.BadZipFile as e:
+                raise CVATError(f"Invalid ZIP file downloaded: {e}") from e
+            except zipfile.LargeZipFile as e:
+                raise CVATError(f"ZIP file too large to extract: {e}") from e
+            except Exception as e:
+                raise CVATError(f"Failed to extract ZIP file: {e}") from e
 
-        logger.info(f"Task {task_id} downloaded successfully to {task_output_dir}")
+        logger.info("Task %s downloaded successfully to %s", task_id, task_output_dir)
         return task_output_dir
+
+    def download_tasks(
+        self,
+        task_ids: Iterable[int],
+        output_dir: Path,
+        format: str = "COCO 1.0",
+        save_images: bool = True,
+        timeout: int = 300,
+        chunk_size: int = _DOWNLOAD_CHUNK_SIZE,
+        max_workers: int = _DOWNLOAD_WORKERS,
+        include: Optional[Iterable[str]] = None,
+    ) -> List[Path]:
+        """
+        Download several tasks' datasets concurrently, reusing this client's
+        HTTP session.
+
+        Args:
+            task_ids: The task IDs to download
+            output_dir: Directory where the extracted datasets will be saved
+            format: Annotation format (default: "COCO 1.0")
+            save_images: Whether to include images in the export (default: True)
+            timeout: Maximum time to wait for each download in seconds (default: 300)
+            chunk_size: Bytes read from each response at a time (default: 1 MiB)
+            max_workers: Number of tasks downloaded at the same time (default: 4)
+            include: Glob patterns of ZIP members to extract, e.g.
+                ["annotations/*"] (default: None, extract everything)
+
+        Returns:
+            Paths to the extracted dataset directories, in the order of `task_ids`
+
+        Raises:
+            CVATError: If any download or extraction fails
+        """
+        if include is not None:
+            # Shared by every download, a one-shot iterator would only serve one
+            include = tuple(include)
+
+        def download(task_id: int) -> Path:
+            return self.download_task(
+                task_id=task_id,
+                output_dir=output_dir,
+                format=format,
+                save_images=save_images,
+                timeout=timeout,
+                chunk_size=chunk_size,
+                include=include,
+            )
+
+        # Downloads wait on the network and release the GIL, so threads overlap
+        # them well. Results come back in order and the first failure is raised
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(download, task_ids))
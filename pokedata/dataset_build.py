@@ -1,9 +1,13 @@
-from collections import defaultdict
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from enum import Enum
+import logging
+import os
 from pathlib import Path
 import shutil
-from typing import Counter, List, Set, Tuple, TypeAlias
-from loguru import logger
+import sys
+from typing import Dict, Iterable, List, Set, Tuple, TypeAlias
 import polvo as pv
 
 from pokedata.dataset_layout import DatasetLayout
@@ -15,11 +19,16 @@ __all__ = [
     "CvatTask",
     "RecordPlan",
     "DatasetPlan",
+    "Materialize",
     "build_dataset",
     "plan_dataset",
+    "materialize_dataset",
 ]
 
 
+logger = logging.getLogger(__name__)
+
+
 class DatasetBuildError(Exception):
     """Raised when dataset build fails."""
 
@@ -29,6 +38,28 @@ class DatasetBuildError(Exception):
 CvatTask: TypeAlias = str
 
 
+class Materialize(Enum):
+    """How record files are placed into the canonical dataset."""
+
+    # Independent copies, cloned copy-on-write where the filesystem allows
+    COPY = "copy"
+    # Hardlinks to the cvat_raw files, sharing their inodes. Cheapest, but
+    # rewriting a cvat_raw file in place also changes the canonical record
+    HARDLINK = "hardlink"
+    # Absolute symlinks into cvat_raw. Consumers must follow symlinks, see
+    # `materialize_dataset` to turn them into copies before shipping
+    SYMLINK = "symlink"
+
+
+_COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Linux ioctl cloning a file's extents copy-on-write (btrfs, XFS, ...)
+_FICLONE = 0x40049409
+# Destination directories whose filesystem refused a clone
+_NO_REFLINK_DIRS: Set[Path] = set()
+
+
 @dataclass(frozen=True)
 class RecordPlan:
     stem: str
@@ -46,14 +77,18 @@ class DatasetPlan:
     record_copies: list[RecordPlan]
 
 
-def build_dataset(dataset_layout: DatasetLayout, splitter: Splitter) -> Path:
+def build_dataset(
+    dataset_layout: DatasetLayout,
+    splitter: Splitter,
+    materialize: Materialize = Materialize.COPY,
+) -> Path:
     """Build a dataset from a directory of images and annotations."""
 
     _ensure_empty_directory(dataset_layout.canonical)
 
     records, tasks = records_from_cvat_raw(dataset_layout.cvat_raw)
     plan = plan_dataset(records, tasks, dataset_layout, splitter)
-    return execute_dataset_plan(plan)
+    return execute_dataset_plan(plan, materialize)
 
 
 def plan_dataset(
@@ -64,7 +99,7 @@ def plan_dataset(
 ) -> DatasetPlan:
     """Plan a dataset build."""
     record_copies = []
-    for record in records:
+    for record, split in zip(records, splitter.split_many(records)):
         record_copies.append(
             RecordPlan(
                 stem=record.stem,
@@ -72,89 +107,191 @@ def plan_dataset(
                 src_annotation=record.annotation_path,
                 dst_image=layout.records / record.image_path.name,
                 dst_annotation=layout.records / record.annotation_path.name,
-                split=splitter.split(record),
+                split=split,
             )
         )
-    assert len(record_copies) == len(set(record_copies))
+    stems = [record_copy.stem for record_copy in record_copies]
+    if len(stems) != len(set(stems)):
+        duplicate_stems = [stem for stem, count in Counter(stems).items() if count > 1]
+        raise DatasetBuildError(f"Duplicate record stems in plan: {duplicate_stems}")
     return DatasetPlan(layout=layout, tasks=tasks, record_copies=record_copies)
 
 
-def execute_dataset_plan(plan: DatasetPlan) -> Path:
+def execute_dataset_plan(
+    plan: DatasetPlan, materialize: Materialize = Materialize.COPY
+) -> Path:
     """Execute a dataset plan."""
     plan.layout.canonical.mkdir(parents=True)
-    logger.info(f"Found {len(plan.tasks)} tasks")
-    pv.save_txt("\n".join(plan.tasks), plan.layout.canonical / "tasks.txt")
+    logger.info("Found %d tasks", len(plan.tasks))
+    _save_lines(plan.tasks, plan.layout.canonical / "tasks.txt")
 
     logger.info(
-        f"Copying {len(plan.record_copies)} records to {plan.layout.records.absolute()}"
+        "Placing %d records in %s (%s)",
+        len(plan.record_copies),
+        plan.layout.records.absolute(),
+        materialize.value,
     )
     plan.layout.records.mkdir()
+    file_copies = []
+    for record_copy in plan.record_copies:
+        file_copies.append((record_copy.src_image, record_copy.dst_image))
+        file_copies.append((record_copy.src_annotation, record_copy.dst_annotation))
+    # Copies are I/O bound and release the GIL, so threads overlap them well
+    with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as executor:
+        results = executor.map(_MATERIALIZERS[materialize], file_copies)
+        # Links are a single syscall each, a progress bar would only add overhead
+        if materialize is Materialize.COPY:
+            results = _pbar(results, total=len(file_copies))
+        for _ in results:
+            pass
+
     splits = {split: [] for split in DatasetSplit}
-    for record_copy in pv.pbar(plan.record_copies):
-        shutil.copy(record_copy.src_image.absolute(), record_copy.dst_image.absolute())
-        shutil.copy(
-            record_copy.src_annotation.absolute(), record_copy.dst_annotation.absolute()
-        )
+    for record_copy in plan.record_copies:
         splits[record_copy.split].append(record_copy)
 
     plan.layout.splits.mkdir()
     for split, split_records in splits.items():
-        logger.info(f"{split}: {len(split_records)} records")
+        logger.info("%s: %d records", split, len(split_records))
         split_path = plan.layout.splits / f"{split.value}.txt"
-        pv.save_txt("\n".join(record.stem for record in split_records), split_path)
+        _save_lines((record.stem for record in split_records), split_path)
 
     return plan.layout.canonical
 
 
-def find_duplicate_filenames(paths: List[Path]) -> Set[Path]:
-    by_name: dict[str, list[Path]] = defaultdict(list)
-
-    for path in paths:
-        by_name[path.name].append(path)
-
-    return [paths for paths in by_name.values() if len(paths) > 1]
+def _pbar(iterable: Iterable, total: int) -> Iterable:
+    """Progress bar that redraws about 200 times over `total` items at most."""
+    miniters = max(1, total // 200)
+    return pv.pbar(iterable, total=total, mininterval=0.25, miniters=miniters)
+
+
+def _save_lines(lines: Iterable[str], path: Path) -> None:
+    """Write newline-separated lines without building the joined string."""
+    lines = iter(lines)
+    with open(path, "w", buffering=_WRITE_BUFFER_SIZE) as f:
+        f.write(next(lines, ""))
+        f.writelines("\n" + line for line in lines)
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Clone `src` into `dst` without copying data, if the filesystem allows it."""
+    if not sys.platform.startswith("linux") or dst.parent in _NO_REFLINK_DIRS:
+        return False
+
+    import fcntl
+
+    try:
+        with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+            fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+    except OSError:
+        _NO_REFLINK_DIRS.add(dst.parent)
+        return False
+    return True
+
+
+def _copy_file(src_dst: Tuple[Path, Path]) -> None:
+    src, dst = src_dst
+    if not _reflink(src, dst):
+        shutil.copyfile(src, dst)
+
+
+def _hardlink_file(src_dst: Tuple[Path, Path]) -> None:
+    src, dst = src_dst
+    try:
+        os.link(src, dst)
+    except OSError:
+        # e.g. cvat_raw and canonical live on different devices
+        _copy_file(src_dst)
+
+
+def _symlink_file(src_dst: Tuple[Path, Path]) -> None:
+    src, dst = src_dst
+    os.symlink(src.resolve(), dst)
+
+
+_MATERIALIZERS = {
+    Materialize.COPY: _copy_file,
+    Materialize.HARDLINK: _hardlink_file,
+    Materialize.SYMLINK: _symlink_file,
+}
+
+
+def _detach_file(path: Path) -> bool:
+    """Replace a symlinked or hardlinked record file with its own copy."""
+    if path.is_symlink():
+        src = path.resolve(strict=True)
+    elif path.stat().st_nlink > 1:
+        src = path
+    else:
+        return False
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    _copy_file((src, tmp_path))
+    os.replace(tmp_path, path)
+    return True
+
+
+def _collect_images_and_annotations(
+    root: Path,
+) -> Tuple[Dict[str, Path], Dict[str, Path]]:
+    """Map stems to the `.png` and `.xml` files under `root`, in a single walk.
+
+    Hidden files and directories are skipped, matching `pv.get_files`.
+    """
+    image_by_stem: Dict[str, Path] = {}
+    annotation_by_stem: Dict[str, Path] = {}
+    for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        parent = Path(dirpath)
+        for name in filenames:
+            stem, dot, extension = name.rpartition(".")
+            if not dot or name.startswith("."):
+                continue
+            extension = extension.lower()
+            if extension == "png":
+                by_stem, kind = image_by_stem, "images"
+            elif extension == "xml":
+                by_stem, kind = annotation_by_stem, "annotations"
+            else:
+                continue
+
+            path = parent / name
+            if (other := by_stem.setdefault(stem, path)) is not path:
+                raise DatasetBuildError(f"Duplicate {kind} found: {[other, path]}")
+    return image_by_stem, annotation_by_stem
 
 
 def records_from_cvat_raw(dataset_path: Path) -> Tuple[List[Record], Set[CvatTask]]:
-    image_paths = pv.get_files(dataset_path, extensions=[".png"])
-    annotation_paths = pv.get_files(dataset_path, extensions=[".xml"])
-
-    if duplicate_filenames := find_duplicate_filenames(image_paths):
-        raise DatasetBuildError(f"Duplicate images found: {duplicate_filenames}")
-    if duplicate_filenames := find_duplicate_filenames(annotation_paths):
-        raise DatasetBuildError(f"Duplicate annotations found: {duplicate_filenames}")
-
-    stem2image_path = {path.stem: path for path in image_paths}
-    stem2annotation_path = {path.stem: path for path in annotation_paths}
-
-    if stem2image_path.keys() != stem2annotation_path.keys():
-        missing_images = stem2annotation_path.keys() - stem2image_path.keys()
-        missing_annotations = stem2image_path.keys() - stem2annotation_path.keys()
+    image_by_stem, annotation_by_stem = _collect_images_and_annotations(dataset_path)
+
+    pairs = []
+    missing_annotations = set()
+    for stem, image_path in image_by_stem.items():
+        annotation_path = annotation_by_stem.get(stem)
+        if annotation_path is None:
+            missing_annotations.add(stem)
+        else:
+            pairs.append((image_path, annotation_path))
+
+    if missing_annotations or len(pairs) != len(annotation_by_stem):
+        missing_images = annotation_by_stem.keys() - image_by_stem.keys()
         raise DatasetBuildError(
             f"Mismatched images/annotations. "
             f"Missing images: {missing_images}, "
             f"Missing annotations: {missing_annotations}"
         )
 
+    # Images live in <task>/<subset>/, validate each directory once
     tasks = set()
-    records = []
-    for stem, image_path in stem2image_path.items():
-        annotation_path = stem2annotation_path[stem]
-
-        if image_path.stem != annotation_path.stem:
-            raise DatasetBuildError(
-                f"Image and annotation names do not match: {image_path} {annotation_path}"
-            )
-
-        record = Record(
-            image_path=image_path,
-            annotation_path=annotation_path,
-        )
-        records.append(record)
-        if not (task_name := image_path.parent.parent.name).startswith("task_"):
-            raise DatasetBuildError(f"Invalid task name: {task_name} for {image_path}")
+    for image_dir in {image_path.parent for image_path, _ in pairs}:
+        if not (task_name := image_dir.parent.name).startswith("task_"):
+            raise DatasetBuildError(f"Invalid task name: {task_name} for {image_dir}")
         tasks.add(task_name)
 
+    records = [
+        Record(image_path=image_path, annotation_path=annotation_path)
+        for image_path, annotation_path in pairs
+    ]
+
     return records, tasks
 
 
@@ -162,6 +299,26 @@ def delete_dataset(dataset_layout: DatasetLayout) -> None:
     shutil.rmtree(dataset_layout.canonical, ignore_errors=True)
 
 
+def materialize_dataset(dataset_layout: DatasetLayout) -> int:
+    """Turn linked records of a canonical dataset into independent copies.
+
+    Returns the number of files that were replaced.
+    """
+    try:
+        paths = [entry.path for entry in os.scandir(dataset_layout.records)]
+    except FileNotFoundError:
+        raise DatasetBuildError(
+            f"No canonical dataset to materialize at {dataset_layout.canonical}"
+        ) from None
+    logger.info("Materializing %d files in %s", len(paths), dataset_layout.records)
+    with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as executor:
+        detached = sum(
+            _pbar(executor.map(_detach_file, map(Path, paths)), total=len(paths))
+        )
+    logger.info("Replaced %d linked files with copies", detached)
+    return detached
+
+
 def _ensure_empty_directory(directory: Path) -> None:
     if directory.exists() and any(directory.iterdir()):
         raise DatasetBuildError(
@@ -1,17 +1,35 @@
 # create a CLI command to build a dataset
 # `pokedata dataset build`
 
-from loguru import logger
+import logging
+
 import typer
-from pokedata.dataset_build import build_dataset, delete_dataset
 
-from pokedata.dataset_splits import CertIdSplitter, RatioSplitPolicy
+logger = logging.getLogger(__name__)
 
 dataset_app = typer.Typer(help="Dataset operations")
 
 
 @dataset_app.command()
-def rebuild(ctx: typer.Context) -> None:
+def rebuild(
+    ctx: typer.Context,
+    materialize: str = typer.Option(
+        "copy",
+        help="How records are placed in the dataset: copy, hardlink or symlink. "
+        "Symlinked datasets need `dataset materialize` before shipping.",
+    ),
+) -> None:
+    from pokedata.dataset_build import Materialize, build_dataset, delete_dataset
+    from pokedata.dataset_splits import CertIdSplitter, RatioSplitPolicy
+
+    try:
+        materialize_mode = Materialize(materialize)
+    except ValueError:
+        raise typer.BadParameter(
+            f"Expected one of: {', '.join(m.value for m in Materialize)}",
+            param_hint="--materialize",
+        )
+
     cli_context = ctx.obj
     dataset_layout = cli_context.dataset_layout
 
@@ -21,11 +39,11 @@ def rebuild(ctx: typer.Context) -> None:
     if not confirm:
         raise typer.Abort()
 
-    logger.info(f"Deleting previous dataset {dataset_layout.canonical}")
+    logger.info("Deleting previous dataset %s", dataset_layout.canonical)
     delete_dataset(dataset_layout)
 
     splits = cli_context.config["datasets"]["splits"]
-    logger.info(f"Splitter seed: {splits['seed']}")
+    logger.info("Splitter seed: %s", splits["seed"])
     split_policy = RatioSplitPolicy(
         train=splits["train"],
         val=splits["val"],
@@ -33,5 +51,18 @@ def rebuild(ctx: typer.Context) -> None:
     )
     splitter = CertIdSplitter(split_policy, seed=splits["seed"])
 
-    logger.info(f"Building dataset {dataset_layout.canonical}")
-    build_dataset(dataset_layout=dataset_layout, splitter=splitter)
+    logger.info("Building dataset %s", dataset_layout.canonical)
+    build_dataset(
+        dataset_layout=dataset_layout,
+        splitter=splitter,
+        materialize=materialize_mode,
+    )
+
+
+@dataset_app.command()
+def materialize(ctx: typer.Context) -> None:
+    """Replace symlinked or hardlinked records with independent copies."""
+    from pokedata.dataset_build import materialize_dataset
+
+    dataset_layout = ctx.obj.dataset_layout
+    materialize_dataset(dataset_layout)
@@ -15,6 +15,7 @@ __all__ = [
     "HashSplitter",
     "CertIdSplitter",
     "extract_card_identity",
+    "extract_card_identities",
 ]
 
 
@@ -37,6 +38,10 @@ class SplitPolicy(ABC):
     @abstractmethod
     def split(self, score: SplitScore) -> DatasetSplit: ...
 
+    def split_byte(self, hash_byte: int) -> DatasetSplit:
+        """Split a hash byte in [0, 256), as scored by `compute_hash_score`."""
+        return self.split(SplitScore(hash_byte / 256.0))
+
 
 @dataclass(frozen=True)
 class RatioSplitPolicy(SplitPolicy):
@@ -58,6 +63,12 @@ class RatioSplitPolicy(SplitPolicy):
                 (1.0, DatasetSplit.TEST),
             ),
         )
+        # Hash bytes only take 256 values, so split each of them up front
+        object.__setattr__(
+            self,
+            "_split_by_byte",
+            tuple(self.split(SplitScore(b / 256.0)) for b in range(256)),
+        )
 
     def split(self, score: SplitScore) -> DatasetSplit:
         for limit, split in self._thresholds:
@@ -66,6 +77,9 @@ class RatioSplitPolicy(SplitPolicy):
 
         raise RuntimeError("Unreachable")
 
+    def split_byte(self, hash_byte: int) -> DatasetSplit:
+        return self._split_by_byte[hash_byte]
+
 
 SplitMap: TypeAlias = Dict[DatasetSplit, List[Record]]
 
@@ -74,11 +88,14 @@ class Splitter(ABC):
     @abstractmethod
     def split(self, record: Record) -> DatasetSplit: ...
 
+    def split_many(self, records: List[Record]) -> List[DatasetSplit]:
+        """Split many records at once, in order. Subclasses may batch the work."""
+        return [self.split(record) for record in records]
+
     def split_records(self, records: List[Record]) -> SplitMap:
-        splits = {
-            split: [r for r in records if self.split(r) == split]
-            for split in DatasetSplit
-        }
+        splits = {split: [] for split in DatasetSplit}
+        for record, split in zip(records, self.split_many(records)):
+            splits[split].append(record)
         if sum(len(split_records) for split_records in splits.values()) != len(records):
             raise ValueError(
                 f"The sums of the splits are not equal to the total number of records: "
@@ -100,10 +117,20 @@ class StaticSplitter(Splitter):
             raise KeyError(f"No split mapping for record with stem {record.stem}")
 
 
+def _seeded_hash(seed: int) -> "hashlib._Hash":
+    """Hash state with the `{seed}:` key prefix already consumed"""
+    return hashlib.sha256(f"{seed}:".encode("utf-8"))
+
+
+def _first_hash_byte(seeded_hash: "hashlib._Hash", stem: str) -> int:
+    stem_hash = seeded_hash.copy()
+    stem_hash.update(stem.encode("utf-8"))
+    return stem_hash.digest()[0]
+
+
 def compute_first_hash_byte(stem: str, seed: int) -> int:
     """Compute the first byte of the hash of a filename stem"""
-    key = f"{seed}:{stem}".encode("utf-8")
-    return hashlib.sha256(key).digest()[0]
+    return _first_hash_byte(_seeded_hash(seed), stem)
 
 
 def compute_hash_score(stem: str, seed: int) -> SplitScore:
@@ -116,39 +143,70 @@ class HashSplitter(Splitter):
     def __init__(self, policy: SplitPolicy, seed: int):
         self.seed = seed
         self.policy = policy
+        self._seeded_hash = _seeded_hash(seed)
 
     def split(self, record: Record) -> DatasetSplit:
-        split_score = compute_hash_score(record.stem, self.seed)
-        return self.policy.split(split_score)
+        return self.policy.split_byte(_first_hash_byte(self._seeded_hash, record.stem))
 
+    def split_many(self, records: List[Record]) -> List[DatasetSplit]:
+        split_byte, seeded_hash = self.policy.split_byte, self._seeded_hash
+        return [split_byte(_first_hash_byte(seeded_hash, r.stem)) for r in records]
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class CardIdentity:
     order_id: str
     certificate_id: str
     orientation: str
 
 
+_CARD_IDENTITY_RE = re.compile(r"^(RG\d{9})(?=\D).*-\+(\d{8})-\+(front|back)_laser$")
+
+
+def _match_card(stem: str) -> re.Match[str]:
+    """Matches a filename against the card identity pattern, or raises ValueError."""
+    match = _CARD_IDENTITY_RE.match(stem)
+    if match is None:
+        raise ValueError(f"Failed to extract from {stem}")
+    return match
+
+
 def extract_card_identity(stem: str) -> CardIdentity:
     """Extracts order ID, certificate ID, and orientation from a given filename."""
-    pattern = r"^(RG\d{9})(?=\D).*-\+(\d{8})-\+(front|back)_laser$"
-    match = re.match(pattern, stem)
-    try:
-        return CardIdentity(
-            order_id=match.group(1),
-            certificate_id=match.group(2),
-            orientation=match.group(3),
-        )
-    except:
-        raise ValueError(f"Failed to extract from {stem}")
+    match = _match_card(stem)
+    return CardIdentity(
+        order_id=match.group(1),
+        certificate_id=match.group(2),
+        orientation=match.group(3),
+    )
+
+
+def extract_card_identities(stems: List[str]) -> List[CardIdentity]:
+    """Extracts card identities from many filenames, see `extract_card_identity`."""
+    return [extract_card_identity(stem) for stem in stems]
 
 
 class CertIdSplitter(Splitter):
     def __init__(self, policy: SplitPolicy, seed: int):
         self.seed = seed
         self.policy = policy
+        self._seeded_hash = _seeded_hash(seed)
 
     def split(self, record: Record) -> DatasetSplit:
         card_identity = extract_card_identity(record.stem)
-        split_score = compute_hash_score(card_identity.certificate_id, self.seed)
-        return self.policy.split(split_score)
+        return self.policy.split_byte(
+            _first_hash_byte(self._seeded_hash, card_identity.certificate_id)
+        )
+
+    def split_many(self, records: List[Record]) -> List[DatasetSplit]:
+        certificate_ids = [
+            card_identity.certificate_id
+            for card_identity in extract_card_identities([r.stem for r in records])
+        ]
+        # Front and back images share a certificate ID, split each ID once
+        split_byte, seeded_hash = self.policy.split_byte, self._seeded_hash
+        id2split = {
+            certificate_id: split_byte(_first_hash_byte(seeded_hash, certificate_id))
+            for certificate_id in dict.fromkeys(certificate_ids)
+        }
+        return [id2split[certificate_id] for certificate_id in certificate_ids]
@@ -1,15 +1,13 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Record:
     image_path: Path
     annotation_path: Path
-
-    @property
-    def stem(self) -> str:
-        return self.image_path.stem
+    # Derived from image_path once, stems are read many times while splitting
+    stem: str = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         image_stem = self.image_path.stem
@@ -19,3 +17,4 @@ class Record:
             raise ValueError(
                 f"Stem mismatch: image={image_stem}, annotation={annotation_stem}"
             )
+        object.__setattr__(self, "stem", image_stem)
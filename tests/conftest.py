@@ -1,6 +1,7 @@
 import pytest
 from pathlib import Path
 
+from pokedata.dataset_layout import DatasetLayout
 from pokedata.dataset_splits import DatasetSplit
 from pokedata.record import Record
 
@@ -43,6 +44,15 @@ def record_factory(tmp_path):
     return _make
 
 
+@pytest.fixture(scope="session")
+def data_layout() -> DatasetLayout:
+    """
+    Layout rooted at the relative path `data`, for tests that only derive paths.
+    `DatasetLayout` is frozen, so a single instance is shared.
+    """
+    return DatasetLayout(dataset_repo=Path("data"))
+
+
 @pytest.fixture
 def pinned_split_stems() -> tuple[list[str], list[DatasetSplit]]:
     """
@@ -7,6 +7,7 @@ from pokedata.config import (
     ConfigError,
     _substitute_env_vars,
     _merge_config,
+    clear_config_cache,
     load_config_structure,
     resolve_config_variables,
     load_config,
@@ -97,6 +98,29 @@ class TestSubstituteEnvVars:
         ):
             _substitute_env_vars(config, variables)
 
+    def test_nested_lists_and_dicts_are_copied(self):
+        """Test that substitution reaches mixed nesting without mutating the input."""
+        variables = {"VAR1": "value1"}
+        config = {"a": [{"b": ["${VAR1}", 1]}, "${VAR1}"]}
+        result = _substitute_env_vars(config, variables)
+        assert result == {"a": [{"b": ["value1", 1]}, "value1"]}
+        assert config == {"a": [{"b": ["${VAR1}", 1]}, "${VAR1}"]}
+
+    def test_each_variable_is_looked_up_once(self):
+        """Test that repeated placeholders resolve their variable a single time."""
+        lookups = []
+
+        class CountingVariables(dict):
+            def __getitem__(self, key):
+                lookups.append(key)
+                return super().__getitem__(key)
+
+        variables = CountingVariables(VAR1="value1", VAR2="value2")
+        config = {"a": "${VAR1}", "b": ["${VAR1}/${VAR2}", "${VAR2}"]}
+        result = _substitute_env_vars(config, variables)
+        assert result == {"a": "value1", "b": ["value1/value2", "value2"]}
+        assert sorted(lookups) == ["VAR1", "VAR2"]
+
 
 class TestMergeConfig:
     """Tests for _merge_config function."""
@@ -171,6 +195,14 @@ class TestMergeConfig:
         assert result["level1"]["level2"]["level3"] == "override_value"
         assert result["level1"]["level2"]["other"] == "base_other"
 
+    def test_does_not_mutate_inputs(self):
+        """Test that merging leaves base and override untouched."""
+        base = {"cvat": {"url": "https://base.example.com"}}
+        override = {"cvat": {"username": "override_user"}}
+        _merge_config(base, override)
+        assert base == {"cvat": {"url": "https://base.example.com"}}
+        assert override == {"cvat": {"username": "override_user"}}
+
 
 class TestLoadConfigStructure:
     """Tests for load_config_structure function."""
@@ -212,6 +244,40 @@ cvat:
         with pytest.raises(ConfigError, match="must contain a YAML dictionary"):
             load_config_structure(config_file)
 
+    def test_cached_result_is_a_copy(self, tmp_path):
+        """Test that mutating a loaded config does not affect later loads."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("cvat:\n  url: https://example.com\n")
+        first = load_config_structure(config_file)
+        first["cvat"]["url"] = "mutated"
+        second = load_config_structure(config_file)
+        assert second["cvat"]["url"] == "https://example.com"
+
+    def test_cached_ordered_map_is_a_copy(self, tmp_path):
+        """Test that values nested in !!omap pairs are copied too."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("x: !!omap\n  - a: 1\n  - b: {c: 2}\n")
+        first = load_config_structure(config_file)
+        first["x"][1][1]["c"] = 99
+        second = load_config_structure(config_file)
+        assert second["x"] == [("a", 1), ("b", {"c": 2})]
+
+    def test_reloads_modified_file(self, tmp_path):
+        """Test that a modified file is parsed again."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("key: old\n")
+        assert load_config_structure(config_file)["key"] == "old"
+        config_file.write_text("key: newer\n")
+        assert load_config_structure(config_file)["key"] == "newer"
+
+    def test_clear_config_cache(self, tmp_path):
+        """Test that clearing the cache forces a re-parse."""
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text("key: value\n")
+        load_config_structure(config_file)
+        clear_config_cache()
+        assert load_config_structure(config_file) == {"key": "value"}
+
 
 class TestResolveConfigVariables:
     """Tests for resolve_config_variables function."""
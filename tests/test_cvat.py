@@ -38,6 +38,15 @@ class TestCVATClient:
         assert client.auth == "test_token"
         assert client.session.headers["Authorization"] == "test_token"
 
+    def test_init_retries_gateway_errors(self):
+        """Test that the session retries transient gateway errors."""
+        client = CVATClient(api_url="https://example.com/api/v1", auth="test_token")
+        retries = client.session.get_adapter("https://example.com").max_retries
+        assert retries.total == 3
+        assert HTTPStatus.SERVICE_UNAVAILABLE in retries.status_forcelist
+        assert HTTPStatus.NOT_FOUND not in retries.status_forcelist
+        assert not retries.raise_on_status
+
 
 class TestDownloadTask:
     """Tests for download_task method."""
@@ -204,6 +213,29 @@ class TestDownloadTask:
         with pytest.raises(CVATError, match="Invalid ZIP file"):
             client.download_task(task_id=123, output_dir=tmp_path)
 
+    @patch("pokedata.cvat.logger")
+    def test_download_task_invalid_zip_stops_early(self, mock_logger, tmp_path):
+        """Test that a body without a ZIP signature is not read to the end."""
+        client = CVATClient(
+            api_url="https://example.com/api/v1", auth="Bearer test_token"
+        )
+        read_chunks = []
+
+        def chunks():
+            for chunk in [b"<h", b"tml>", b"<body>", b"</body></html>"]:
+                read_chunks.append(chunk)
+                yield chunk
+
+        mock_response = Mock()
+        mock_response.status_code = HTTPStatus.OK
+        mock_response.iter_content = Mock(return_value=chunks())
+        mock_response.raise_for_status = Mock()
+        client.session.get = Mock(return_value=mock_response)
+
+        with pytest.raises(CVATError, match="unexpected signature"):
+            client.download_task(task_id=123, output_dir=tmp_path)
+        assert read_chunks == [b"<h", b"tml>"]
+
     @patch("pokedata.cvat.logger")
     def test_download_task_io_error(self, mock_logger, tmp_path):
         """Test download when file I/O error occurs."""
@@ -218,8 +250,11 @@ class TestDownloadTask:
         mock_response.raise_for_status = Mock()
         client.session.get = Mock(return_value=mock_response)
 
-        # Mock file write to raise IOError
-        with patch("builtins.open", side_effect=IOError("Disk full")):
+        # Mock the ZIP buffer write to raise IOError
+        with patch(
+            "pokedata.cvat.SpooledTemporaryFile.write",
+            side_effect=IOError("Disk full"),
+        ):
             with pytest.raises(CVATError, match="Failed to save dataset ZIP file"):
                 client.download_task(task_id=123, output_dir=tmp_path)
 
@@ -266,10 +301,57 @@ class TestDownloadTask:
         mock_response.raise_for_status = Mock()
         client.session.get = Mock(return_value=mock_response)
 
-        result_path = client.download_task(task_id=123, output_dir=tmp_path)
+        result_path = client.download_task(
+            task_id=123, output_dir=tmp_path, chunk_size=chunk_size
+        )
 
         # Verify file was reconstructed correctly
         assert (result_path / "annotations" / "instances_default.json").exists()
+        mock_response.iter_content.assert_called_once_with(chunk_size=chunk_size)
+
+    @pytest.mark.parametrize("spool_max_size", [64 * 1024 * 1024, 1])
+    @patch("pokedata.cvat.logger")
+    def test_download_task_extracts_through_spool(
+        self, mock_logger, tmp_path, spool_max_size
+    ):
+        """Test extraction from the spool, in memory and rolled over to disk."""
+        client = CVATClient(
+            api_url="https://example.com/api/v1", auth="Bearer test_token"
+        )
+        mock_zip_data = self._create_mock_zip()
+
+        mock_response = Mock()
+        mock_response.status_code = HTTPStatus.OK
+        mock_response.iter_content = Mock(return_value=[mock_zip_data])
+        mock_response.raise_for_status = Mock()
+        client.session.get = Mock(return_value=mock_response)
+
+        with patch("pokedata.cvat._SPOOL_MAX_SIZE", spool_max_size):
+            result_path = client.download_task(task_id=123, output_dir=tmp_path)
+
+        image_path = result_path / "images" / "test_image.png"
+        assert image_path.read_bytes() == b"fake image data"
+
+    @patch("pokedata.cvat.logger")
+    def test_download_task_include_filters_members(self, mock_logger, tmp_path):
+        """Test that only members matching include patterns are extracted."""
+        client = CVATClient(
+            api_url="https://example.com/api/v1", auth="Bearer test_token"
+        )
+        mock_zip_data = self._create_mock_zip()
+
+        mock_response = Mock()
+        mock_response.status_code = HTTPStatus.OK
+        mock_response.iter_content = Mock(return_value=[mock_zip_data])
+        mock_response.raise_for_status = Mock()
+        client.session.get = Mock(return_value=mock_response)
+
+        result_path = client.download_task(
+            task_id=123, output_dir=tmp_path, include=["annotations/*"]
+        )
+
+        assert (result_path / "annotations" / "instances_default.json").exists()
+        assert not (result_path / "images").exists()
 
     @patch("pokedata.cvat.logger")
     def test_download_task_timeout(self, mock_logger, tmp_path):
@@ -309,3 +391,51 @@ class TestDownloadTask:
 
         call_args = client.session.get.call_args
         assert call_args[1]["params"]["filename"] == f"task_{task_id}_dataset.zip"
+
+    @patch("pokedata.cvat.logger")
+    def test_download_tasks_reuses_session(self, mock_logger, tmp_path):
+        """Test that several tasks are downloaded through one session."""
+        client = CVATClient(
+            api_url="https://example.com/api/v1", auth="Bearer test_token"
+        )
+        mock_zip_data = self._create_mock_zip()
+
+        mock_response = Mock()
+        mock_response.status_code = HTTPStatus.OK
+        mock_response.iter_content = Mock(return_value=[mock_zip_data])
+        mock_response.raise_for_status = Mock()
+        client.session.get = Mock(return_value=mock_response)
+
+        result_paths = client.download_tasks(task_ids=[1, 2], output_dir=tmp_path)
+
+        assert result_paths == [tmp_path / "task_1", tmp_path / "task_2"]
+        for result_path in result_paths:
+            assert (result_path / "images" / "test_image.png").exists()
+        assert client.session.get.call_count == 2
+
+    @patch("pokedata.cvat.logger")
+    def test_download_tasks_raises_failed_task(self, mock_logger, tmp_path):
+        """Test that a failing task among concurrent downloads raises CVATError."""
+        client = CVATClient(
+            api_url="https://example.com/api/v1", auth="Bearer test_token"
+        )
+        mock_zip_data = self._create_mock_zip()
+
+        ok_response = Mock()
+        ok_response.status_code = HTTPStatus.OK
+        ok_response.iter_content = Mock(return_value=[mock_zip_data])
+        ok_response.raise_for_status = Mock()
+
+        missing_response = Mock()
+        missing_response.status_code = HTTPStatus.NOT_FOUND
+        missing_response.raise_for_status = Mock(
+            side_effect=requests.exceptions.HTTPError(response=missing_response)
+        )
+
+        def get(url, **kwargs):
+            return missing_response if "/tasks/2/" in url else ok_response
+
+        client.session.get = Mock(side_effect=get)
+
+        with pytest.raises(CVATError, match="Task 2 not found"):
+            client.download_tasks(task_ids=[1, 2, 3], output_dir=tmp_path)
@@ -1,14 +1,16 @@
-from pathlib import Path
-
 import pytest
 
 from pokedata.dataset_build import (
     DatasetBuildError,
+    _copy_file,
+    _save_lines,
     build_dataset,
     plan_dataset,
     DatasetPlan,
+    Materialize,
     RecordPlan,
     execute_dataset_plan,
+    materialize_dataset,
     records_from_cvat_raw,
 )
 from pokedata.dataset_layout import DatasetLayout
@@ -20,8 +22,8 @@ def test_records_from_cvat_raw_single_task(tmp_path):
     task_dir = cvat_raw / "task_123/default"
     task_dir.mkdir(parents=True)
 
-    (task_dir / "x.png").write_bytes(b"x")
-    (task_dir / "x.xml").write_text("<xml />")
+    (task_dir / "x.png").touch()
+    (task_dir / "x.xml").touch()
 
     records, tasks = records_from_cvat_raw(cvat_raw)
 
@@ -38,13 +40,13 @@ def test_records_from_cvat_raw_multi_task(tmp_path):
 
     task_dir_1 = cvat_raw / "task_123/default"
     task_dir_1.mkdir(parents=True)
-    (task_dir_1 / "x.png").write_bytes(b"x")
-    (task_dir_1 / "x.xml").write_text("<xml />")
+    (task_dir_1 / "x.png").touch()
+    (task_dir_1 / "x.xml").touch()
 
     task_dir_2 = cvat_raw / "task_456/default"
     task_dir_2.mkdir(parents=True)
-    (task_dir_2 / "y.png").write_bytes(b"y")
-    (task_dir_2 / "y.xml").write_text("<xml />")
+    (task_dir_2 / "y.png").touch()
+    (task_dir_2 / "y.xml").touch()
 
     records, tasks = records_from_cvat_raw(cvat_raw)
 
@@ -57,8 +59,8 @@ def test_records_from_cvat_invalid_folder_structure(tmp_path):
     cvat_raw = tmp_path / "cvat_raw"
     task_dir = cvat_raw / "task_123"
     task_dir.mkdir(parents=True)
-    (task_dir / "x.png").write_bytes(b"x")
-    (task_dir / "x.xml").write_text("<xml />")
+    (task_dir / "x.png").touch()
+    (task_dir / "x.xml").touch()
 
     with pytest.raises(DatasetBuildError, match="Invalid task name"):
         records_from_cvat_raw(cvat_raw)
@@ -71,13 +73,26 @@ def test_records_from_cvat_raw_fails_on_duplicate_stems_across_tasks(tmp_path):
     for task in ["task_1", "task_2"]:
         task_dir = cvat_raw / task / "default"
         task_dir.mkdir(parents=True)
-        (task_dir / "x.png").write_bytes(b"x")
-        (task_dir / "x.xml").write_text("<xml />")
+        (task_dir / "x.png").touch()
+        (task_dir / "x.xml").touch()
 
     with pytest.raises(DatasetBuildError):
         records_from_cvat_raw(cvat_raw)
 
 
+def test_records_from_cvat_raw_fails_on_duplicate_stems_within_task(tmp_path):
+    cvat_raw = tmp_path / "cvat_raw"
+    # Same stem in two subsets of one task
+    for subset in ["default", "train"]:
+        subset_dir = cvat_raw / "task_1" / subset
+        subset_dir.mkdir(parents=True)
+        (subset_dir / "x.png").touch()
+        (subset_dir / "x.xml").touch()
+
+    with pytest.raises(DatasetBuildError, match="Duplicate"):
+        records_from_cvat_raw(cvat_raw)
+
+
 def test_records_from_cvat_raw_reports_missing_images_and_annotations_correctly(
     tmp_path,
 ):
@@ -86,12 +101,12 @@ def test_records_from_cvat_raw_reports_missing_images_and_annotations_correctly(
     task_dir.mkdir(parents=True)
 
     # image with annotation
-    (task_dir / "ok.png").write_bytes(b"x")
-    (task_dir / "ok.xml").write_text("<xml />")
+    (task_dir / "ok.png").touch()
+    (task_dir / "ok.xml").touch()
     # image WITHOUT annotation  -> missing annotation
-    (task_dir / "img_only.png").write_bytes(b"x")
+    (task_dir / "img_only.png").touch()
     # annotation WITHOUT image -> missing image
-    (task_dir / "ann_only.xml").write_text("<xml />")
+    (task_dir / "ann_only.xml").touch()
 
     with pytest.raises(DatasetBuildError) as exc:
         records_from_cvat_raw(cvat_raw)
@@ -109,7 +124,7 @@ def test_records_from_cvat_raw_fails_when_annotation_is_missing(tmp_path):
     task_dir.mkdir(parents=True)
 
     # image without annotation
-    (task_dir / "x.png").write_bytes(b"x")
+    (task_dir / "x.png").touch()
 
     with pytest.raises(DatasetBuildError, match="Mismatched images/annotations"):
         records_from_cvat_raw(cvat_raw)
@@ -121,16 +136,16 @@ def test_records_from_cvat_raw_fails_on_mixed_mismatch(tmp_path):
     task_dir.mkdir(parents=True)
 
     # image with no annotation
-    (task_dir / "a.png").write_bytes(b"a")
+    (task_dir / "a.png").touch()
 
     # annotation with no image
-    (task_dir / "b.xml").write_text("<xml />")
+    (task_dir / "b.xml").touch()
 
     with pytest.raises(DatasetBuildError, match="Mismatched images/annotations"):
         records_from_cvat_raw(cvat_raw)
 
 
-def test_plan_dataset_integrates_splitter_and_layout(record_factory):
+def test_plan_dataset_integrates_splitter_and_layout(record_factory, data_layout):
     records = [
         record_factory(stem="x"),
         record_factory(stem="y"),
@@ -142,26 +157,36 @@ def test_plan_dataset_integrates_splitter_and_layout(record_factory):
         }
     )
 
-    layout = DatasetLayout(dataset_repo=Path("data"))
     tasks = ["task_123", "task_456"]
 
     plan = plan_dataset(
         records=records,
         tasks=tasks,
-        layout=layout,
+        layout=data_layout,
         splitter=splitter,
     )
 
     assert plan.tasks == tasks
 
     copy = plan.record_copies[0]
-    assert copy.dst_image == layout.records / records[0].image_path.name
+    assert copy.dst_image == data_layout.records / records[0].image_path.name
     assert copy.split == DatasetSplit.TRAIN
     copy = plan.record_copies[1]
-    assert copy.dst_image == layout.records / records[1].image_path.name
+    assert copy.dst_image == data_layout.records / records[1].image_path.name
     assert copy.split == DatasetSplit.VAL
 
 
+def test_plan_dataset_fails_on_duplicate_stems(record_factory, tmp_path, data_layout):
+    records = [
+        record_factory(stem="x", base_dir=tmp_path / "task_1"),
+        record_factory(stem="x", base_dir=tmp_path / "task_2"),
+    ]
+    splitter = StaticSplitter({"x": DatasetSplit.TRAIN})
+
+    with pytest.raises(DatasetBuildError, match="Duplicate record stems"):
+        plan_dataset(records=records, tasks=[], layout=data_layout, splitter=splitter)
+
+
 def test_execute_dataset_plan_copies_files_and_writes_splits(tmp_path):
     layout = DatasetLayout(dataset_repo=tmp_path)
 
@@ -210,6 +235,28 @@ def test_execute_dataset_plan_copies_files_and_writes_splits(tmp_path):
     assert test_file.exists()
 
 
+def test_copy_file_preserves_content(tmp_path):
+    src = tmp_path / "a.png"
+    dst = tmp_path / "out" / "a.png"
+    dst.parent.mkdir()
+    src.write_bytes(b"image bytes")
+
+    _copy_file((src, dst))
+
+    assert dst.read_bytes() == b"image bytes"
+
+
+@pytest.mark.parametrize(
+    "lines, expected", [([], ""), (["a"], "a"), (["a", "b", "c"], "a\nb\nc")]
+)
+def test_save_lines_matches_join(tmp_path, lines, expected):
+    path = tmp_path / "lines.txt"
+
+    _save_lines(iter(lines), path)
+
+    assert path.read_text() == expected
+
+
 def test_build_dataset_creates_canonical_dataset(tmp_path):
     layout = DatasetLayout(dataset_repo=tmp_path)
 
@@ -242,6 +289,51 @@ def test_build_dataset_creates_canonical_dataset(tmp_path):
     assert train_file.read_text().strip() == "x"
 
 
+def test_build_dataset_hardlinks_records(tmp_path):
+    layout = DatasetLayout(dataset_repo=tmp_path)
+
+    task_dir = layout.cvat_raw / "task_123/default"
+    task_dir.mkdir(parents=True)
+    (task_dir / "x.png").write_bytes(b"x")
+    (task_dir / "x.xml").write_text("<xml />")
+
+    splitter = StaticSplitter({"x": DatasetSplit.TRAIN})
+    build_dataset(layout, splitter, materialize=Materialize.HARDLINK)
+
+    assert (layout.records / "x.png").samefile(task_dir / "x.png")
+    assert (layout.records / "x.xml").samefile(task_dir / "x.xml")
+
+
+@pytest.mark.parametrize("materialize", [Materialize.HARDLINK, Materialize.SYMLINK])
+def test_materialize_dataset_detaches_linked_records(tmp_path, materialize):
+    layout = DatasetLayout(dataset_repo=tmp_path)
+
+    task_dir = layout.cvat_raw / "task_123/default"
+    task_dir.mkdir(parents=True)
+    (task_dir / "x.png").write_bytes(b"x")
+    (task_dir / "x.xml").write_text("<xml />")
+
+    splitter = StaticSplitter({"x": DatasetSplit.TRAIN})
+    build_dataset(layout, splitter, materialize=materialize)
+    assert (layout.records / "x.png").samefile(task_dir / "x.png")
+
+    assert materialize_dataset(layout) == 2
+    assert materialize_dataset(layout) == 0
+
+    record_image = layout.records / "x.png"
+    assert not record_image.is_symlink()
+    assert not record_image.samefile(task_dir / "x.png")
+    assert record_image.read_bytes() == b"x"
+    assert sorted(p.name for p in layout.records.iterdir()) == ["x.png", "x.xml"]
+
+
+def test_materialize_dataset_fails_without_canonical_dataset(tmp_path):
+    layout = DatasetLayout(dataset_repo=tmp_path)
+
+    with pytest.raises(DatasetBuildError, match="No canonical dataset"):
+        materialize_dataset(layout)
+
+
 def test_build_dataset_refuses_non_empty_canonical_dir(tmp_path):
     layout = DatasetLayout(dataset_repo=tmp_path)
 
@@ -8,66 +8,87 @@ from pokedata.dataset_splits import (
     SplitScore,
     compute_first_hash_byte,
     extract_card_identity,
+    extract_card_identities,
 )
 from pokedata.dataset_splits import DatasetSplit, Splitter
 from pokedata.record import Record
 from pokedata.dataset_splits import RatioSplitPolicy, HashSplitter
 
 
-def test_compute_first_hash_byte():
+@pytest.mark.parametrize(
+    "stem, seed, expected",
+    [
+        ("test_image_0", 42, 15),
+        ("test_image_3", 42, 183),
+        ("test_image_4", 42, 109),
+        ("test_image_5", 42, 205),
+        ("test_image_7", 42, 247),
+        ("00000005", 42, 3),
+        ("00000008", 42, 212),
+        ("00000026", 42, 254),
+        ("00000016", 42, 13),
+    ],
+)
+def test_compute_first_hash_byte(stem, seed, expected):
     """Test compute_first_hash_byte."""
-
-    assert compute_first_hash_byte("test_image_0", 42) == 15
-    assert compute_first_hash_byte("test_image_3", 42) == 183
-    assert compute_first_hash_byte("test_image_4", 42) == 109
-    assert compute_first_hash_byte("test_image_5", 42) == 205
-    assert compute_first_hash_byte("test_image_7", 42) == 247
-
-    assert compute_first_hash_byte("00000005", 42) == 3
-    assert compute_first_hash_byte("00000008", 42) == 212
-    assert compute_first_hash_byte("00000026", 42) == 254
-    assert compute_first_hash_byte("00000016", 42) == 13
-
-
-def test_extract_card_identity():
+    assert compute_first_hash_byte(stem, seed) == expected
+
+
+@pytest.mark.parametrize(
+    "stem, expected",
+    [
+        (
+            "RG123456789-+12345678-+front_laser",
+            CardIdentity("RG123456789", "12345678", "front"),
+        ),
+        (
+            "RG123456789-+12345678-+back_laser",
+            CardIdentity("RG123456789", "12345678", "back"),
+        ),
+        (
+            "RG123456789_part4-+12345678-+back_laser",
+            CardIdentity("RG123456789", "12345678", "back"),
+        ),
+        (
+            "RG123456789-+00000005-+front_laser",
+            CardIdentity("RG123456789", "00000005", "front"),
+        ),
+    ],
+)
+def test_extract_card_identity(stem, expected):
     """Test extract_card_identity."""
-    expected = CardIdentity(
-        order_id="RG123456789", certificate_id="12345678", orientation="front"
-    )
-    assert extract_card_identity("RG123456789-+12345678-+front_laser") == expected
+    assert extract_card_identity(stem) == expected
+
+
+@pytest.mark.parametrize(
+    "stem",
+    [
+        # invalid orientation
+        "RG123456789-+12345678-+invalid_orientation.png",
+        # 8 digits for certificate id
+        "RG123456789-+1234567-+front_laser",
+        "RG123456789-+123456789-+front_laser",
+        "RG123456789-+134invalid-+front_laser",
+        # 9 digits for order id
+        "RG12345678-+12345678-+front_laser",
+        "RG1234567890-+12345678-+front_laser",
+        "RGa123456789-+12345678-+front_laser",
+        "RGa12345678-+12345678-+front_laser",
+    ],
+)
+def test_extract_card_identity_rejects_invalid_stems(stem):
+    with pytest.raises(ValueError):
+        extract_card_identity(stem)
 
-    expected = CardIdentity(
-        order_id="RG123456789", certificate_id="12345678", orientation="back"
-    )
-    assert extract_card_identity("RG123456789-+12345678-+back_laser") == expected
-    expected = CardIdentity(
-        order_id="RG123456789", certificate_id="12345678", orientation="back"
-    )
-    assert extract_card_identity("RG123456789_part4-+12345678-+back_laser") == expected
-    expected = CardIdentity(
-        order_id="RG123456789", certificate_id="00000005", orientation="front"
-    )
-    assert extract_card_identity("RG123456789-+00000005-+front_laser") == expected
 
-    # invalid orientation
-    with pytest.raises(ValueError):
-        extract_card_identity("RG123456789-+12345678-+invalid_orientation.png")
-    # 8 digits for certificate id
-    with pytest.raises(ValueError):
-        extract_card_identity("RG123456789-+1234567-+front_laser")
-    with pytest.raises(ValueError):
-        extract_card_identity("RG123456789-+123456789-+front_laser")
-    with pytest.raises(ValueError):
-        extract_card_identity("RG123456789-+134invalid-+front_laser")
-    # 9 digits for order id
-    with pytest.raises(ValueError):
-        extract_card_identity("RG12345678-+12345678-+front_laser")
-    with pytest.raises(ValueError):
-        extract_card_identity("RG1234567890-+12345678-+front_laser")
-    with pytest.raises(ValueError):
-        extract_card_identity("RGa123456789-+12345678-+front_laser")
+def test_extract_card_identities(pinned_split_stems):
+    stems, _ = pinned_split_stems
+
+    assert extract_card_identities(stems) == [
+        extract_card_identity(stem) for stem in stems
+    ]
     with pytest.raises(ValueError):
-        extract_card_identity("RGa12345678-+12345678-+front_laser")
+        extract_card_identities([stems[0], "RG12345678-+12345678-+front_laser"])
 
 
 def test_dummy_splitter(record_factory):
@@ -91,35 +112,40 @@ def test_split_records_detects_missing_assignment(record_factory):
         splitter.split_records(records)
 
 
-def test_hash_splitter():
-    """Test HashSplitter with RatioSplitPolicy."""
-    # Using the same splitter configuration that produces the expected results
-    # Based on hash scores: 0->0.0586, 3->0.7148, 4->0.4258, 5->0.8008, 7->0.9648
-    # We need train < 0.75, val < 0.9, test < 1.0
+@pytest.fixture(scope="module")
+def hash_splitter():
+    """HashSplitter shared by tests that only call its (stateless) split methods."""
     policy = RatioSplitPolicy(train=0.8, val=0.10, test=0.10)
-    splitter = HashSplitter(policy=policy, seed=42)
+    return HashSplitter(policy=policy, seed=42)
 
-    record_0 = Record(
-        image_path=Path("test_image_0.png"), annotation_path=Path("test_image_0.xml")
-    )
-    record_3 = Record(
-        image_path=Path("test_image_3.png"), annotation_path=Path("test_image_3.xml")
-    )
-    record_4 = Record(
-        image_path=Path("test_image_4.png"), annotation_path=Path("test_image_4.xml")
-    )
-    record_5 = Record(
-        image_path=Path("test_image_5.png"), annotation_path=Path("test_image_5.xml")
-    )
-    record_7 = Record(
-        image_path=Path("test_image_7.png"), annotation_path=Path("test_image_7.xml")
+
+# Based on hash scores: 0->0.0586, 3->0.7148, 4->0.4258, 5->0.8008, 7->0.9648
+_HASH_SPLIT_CASES = tuple(
+    (
+        Record(
+            image_path=Path(f"test_image_{i}.png"),
+            annotation_path=Path(f"test_image_{i}.xml"),
+        ),
+        split,
     )
+    for i, split in [
+        (0, DatasetSplit.TRAIN),
+        (3, DatasetSplit.TRAIN),
+        (4, DatasetSplit.TRAIN),
+        (5, DatasetSplit.VAL),
+        (7, DatasetSplit.TEST),
+    ]
+)
 
-    assert splitter.split(record_0) == DatasetSplit.TRAIN
-    assert splitter.split(record_3) == DatasetSplit.TRAIN
-    assert splitter.split(record_4) == DatasetSplit.TRAIN
-    assert splitter.split(record_5) == DatasetSplit.VAL
-    assert splitter.split(record_7) == DatasetSplit.TEST
+
+@pytest.mark.parametrize(
+    "record, expected",
+    _HASH_SPLIT_CASES,
+    ids=[record.stem for record, _ in _HASH_SPLIT_CASES],
+)
+def test_hash_splitter(hash_splitter, record, expected):
+    """Test HashSplitter with RatioSplitPolicy."""
+    assert hash_splitter.split(record) == expected
 
 
 def test_ratio_split_policy_thresholds():
@@ -135,6 +161,17 @@ def test_ratio_split_policy_thresholds():
     assert policy.split(SplitScore(0.999999)) == DatasetSplit.TEST
 
 
+@pytest.mark.parametrize(
+    "ratios",
+    [(0.7, 0.2, 0.1), (0.8, 0.1, 0.1), (0.5, 0.25, 0.25), (1 / 3, 1 / 3, 1 / 3)],
+)
+def test_ratio_split_policy_split_byte_matches_split(ratios):
+    policy = RatioSplitPolicy(*ratios)
+    for hash_byte in range(256):
+        expected = policy.split(SplitScore(hash_byte / 256.0))
+        assert policy.split_byte(hash_byte) == expected
+
+
 def test_ratio_split_policy_ratios_must_sum_to_one():
     with pytest.raises(ValueError):
         RatioSplitPolicy(train=0.5, val=0.3, test=0.3)
@@ -150,3 +187,28 @@ def test_cert_id_splitter(record_factory, pinned_split_stems):
 
     for record, split in zip(records, splits):
         assert splitter.split(record) == split
+
+
+def test_split_many_matches_split(record_factory, pinned_split_stems):
+    policy = RatioSplitPolicy(train=0.8, val=0.1, test=0.1)
+    stems, splits = pinned_split_stems
+    records = [record_factory(stem=stem) for stem in stems]
+
+    for splitter in (
+        CertIdSplitter(policy=policy, seed=42),
+        HashSplitter(policy=policy, seed=42),
+    ):
+        assert splitter.split_many(records) == [splitter.split(r) for r in records]
+    assert CertIdSplitter(policy=policy, seed=42).split_many(records) == splits
+
+
+def test_split_records_groups_records(record_factory, pinned_split_stems):
+    policy = RatioSplitPolicy(train=0.8, val=0.1, test=0.1)
+    splitter = CertIdSplitter(policy=policy, seed=42)
+
+    stems, splits = pinned_split_stems
+    records = [record_factory(stem=stem) for stem in stems]
+    split_map = splitter.split_records(records)
+
+    for split in DatasetSplit:
+        assert split_map[split] == [r for r, s in zip(records, splits) if s == split]
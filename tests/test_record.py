@@ -0,0 +1,22 @@
+from pathlib import Path
+
+import pytest
+
+from pokedata.record import Record
+
+
+def test_record_stem():
+    record = Record(image_path=Path("a/x.png"), annotation_path=Path("a/x.xml"))
+
+    assert record.stem == "x"
+
+
+def test_record_rejects_stem_mismatch():
+    with pytest.raises(ValueError, match="Stem mismatch"):
+        Record(image_path=Path("a/x.png"), annotation_path=Path("a/y.xml"))
+
+
+def test_record_is_slotted():
+    record = Record(image_path=Path("a/x.png"), annotation_path=Path("a/x.xml"))
+
+    assert not hasattr(record, "__dict__")